@@ -2,30 +2,166 @@ import sqlite3
 import re
 import json
 
+# The editor mostly rewrites whole tables, so a smaller mmap window than the read-heavy handler is enough
+EDITOR_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=268435456;
+"""
+
+FETCH_BATCH_SIZE = 1000
+
+_SAFE_IDENT = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+_SQL_TOKEN = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\]|[a-zA-Z_][a-zA-Z0-9_$]*|[(),]""")
+_COLUMN_LIST_KEYWORDS = {"CHECK", "AS", "KEY", "UNIQUE"}
+_TABLE_CONSTRAINT_KEYWORDS = {"CONSTRAINT", "PRIMARY", "UNIQUE", "CHECK", "FOREIGN"}
+
+
+def _identifier_name(token):
+    if token[0] == '"':
+        return token[1:-1].replace('""', '"')
+    if token[0] in '`[':
+        return token[1:-1]
+    if token[0] in "'(),":
+        return None
+    return token
+
+
+def _rename_column_refs(sql, old_name, new_name, is_table=True):
+    # In CREATE TABLE only the column-definition names and the parenthesised lists and expressions of
+    # CHECK, AS, PRIMARY KEY, UNIQUE and FOREIGN KEY name this table's columns; type names and
+    # REFERENCES targets are left alone. In CREATE INDEX everything after the first "(" is a column.
+    depth = 0
+    item_start = False
+    rename_from = None
+    last_word = None
+
+    def replacer(match):
+        nonlocal depth, item_start, rename_from, last_word
+        token = match.group(0)
+        if token == "(":
+            if is_table and depth >= 1 and rename_from is None and last_word in _COLUMN_LIST_KEYWORDS:
+                rename_from = depth + 1
+            if depth == 0 and not is_table:
+                rename_from = 1
+            depth += 1
+            item_start = is_table and depth == 1
+            last_word = None
+            return token
+        if token == ")":
+            depth -= 1
+            if is_table and rename_from is not None and depth < rename_from:
+                rename_from = None
+            last_word = None
+            return token
+        if token == ",":
+            item_start = is_table and depth == 1
+            last_word = None
+            return token
+        name = _identifier_name(token)
+        if name is None:
+            return token
+        last_word = token.upper() if token[0] not in '"`[' else None
+        if item_start:
+            item_start = False
+            if last_word in _TABLE_CONSTRAINT_KEYWORDS:
+                return token
+        elif rename_from is None:
+            return token
+        return _quote_ident(new_name) if name.lower() == old_name.lower() else token
+    return _SQL_TOKEN.sub(replacer, sql)
+
+
+def _references_any(sql, names):
+    return any(
+        (name := _identifier_name(token)) is not None and name.lower() in names
+        for token in _SQL_TOKEN.findall(sql)
+    )
+
+
+def _quote_ident(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
 class SQLiteManager:
     def __init__(self, db_path):
         self.db_path = db_path
+        self.connection = None
+        self._columns = None
+        self._columns_version = None
 
     def _connect(self):
-        return sqlite3.connect(self.db_path)
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.db_path)
+            self.connection.executescript(EDITOR_PRAGMAS)
+            self.connection.row_factory = sqlite3.Row
+        return self.connection
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _pragma(self, cursor, pragma, name):
+        if sqlite3.sqlite_version_info >= (3, 16, 0):
+            return cursor.execute(f"SELECT * FROM pragma_{pragma}(?);", (name,)).fetchall()
+        quoted_name = name.replace('"', '""')
+        return cursor.execute(f'PRAGMA {pragma}("{quoted_name}");').fetchall()
+
+    def _schema_version(self, cursor):
+        return cursor.execute("PRAGMA schema_version;").fetchone()[0]
+
+    def _all_columns(self):
+        cursor = self._connect().cursor()
+        # Other connections can change the schema too, so the cache is only valid for one schema version
+        schema_version = self._schema_version(cursor)
+        if self._columns is None or self._columns_version != schema_version:
+            self._columns = {}
+            self._columns_version = schema_version
+            if sqlite3.sqlite_version_info >= (3, 16, 0):
+                cursor.execute(
+                    "SELECT m.name AS table_name, p.* "
+                    "FROM sqlite_master m, pragma_table_info(m.name) p "
+                    "WHERE m.type='table' ORDER BY m.name, p.cid;"
+                )
+                for col in cursor:
+                    self._columns.setdefault(col["table_name"].lower(), []).append(col)
+            else:
+                tables = cursor.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
+                for (table,) in tables:
+                    self._columns[table.lower()] = self._pragma(cursor, "table_info", table)
+        return self._columns
+
+    def _table_columns(self, table):
+        return self._all_columns().get(table.lower(), [])
+
+    def _vacuum(self):
+        conn = self._connect()
+        isolation_level = conn.isolation_level
+        conn.isolation_level = None
+        try:
+            conn.execute("VACUUM;")
+        finally:
+            conn.isolation_level = isolation_level
 
     def update_subscription_texts(self):
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT id, sql_subscription FROM subscriptions;")
-                subscriptions = cursor.fetchall()
-                updated_count = 0
-
-                for sub_id, text in subscriptions:
-                    if text and "advertisement" in text:
-                        new_text = text.replace("advertisement", "publication")
-                        cursor.execute(
-                            "UPDATE subscriptions SET sql_subscription = ? WHERE id = ?;",
-                            (new_text, sub_id)
-                        )
-                        updated_count += 1
-                print(f"Updated {updated_count} subscription(s).")
+                cursor.execute(
+                    "UPDATE subscriptions "
+                    "SET sql_subscription = REPLACE(sql_subscription, 'advertisement', 'publication') "
+                    "WHERE instr(sql_subscription, 'advertisement') > 0;"
+                )
+                print(f"Updated {cursor.rowcount} subscription(s).")
         except sqlite3.Error as e:
             print(f"SQLite error: {e}")
 
@@ -33,29 +169,41 @@ class SQLiteManager:
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"SELECT id, {version}_subscription FROM subscriptions;")
-                subscriptions = cursor.fetchall()
-                print(f"\nSubscriptions ({len(subscriptions)} total):\n")
-                for sub_id, text in subscriptions:
-                    print(f"ID {sub_id}: {text}\n")
-        except sqlite3.Error as e:
+                cursor.arraysize = FETCH_BATCH_SIZE
+                column = f"{version}_subscription"
+                # A quoted name that matches no column would be read as a string literal
+                if not any(col["name"] == column for col in self._table_columns("subscriptions")):
+                    raise ValueError(f"Column '{column}' not found.")
+                column = _quote_ident(column)
+                (total,) = cursor.execute("SELECT COUNT(*) FROM subscriptions;").fetchone()
+                print(f"\nSubscriptions ({total} total):\n")
+                cursor.execute(f"SELECT id, {column} FROM subscriptions;")
+                while rows := cursor.fetchmany():
+                    for sub_id, text in rows:
+                        print(f"ID {sub_id}: {text}\n")
+        except (sqlite3.Error, ValueError) as e:
             print(f"SQLite error: {e}")
 
     def clean_sql_quotes(self, sql):
+        # Walk whole SQL tokens so escaped quotes ("a""b") and string literals are left intact
         def replacer(match):
-            identifier = match.group(1)
-            return identifier if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', identifier) else f'"{identifier}"'
-        return re.sub(r'"([^"]+)"', replacer, sql).strip()
+            token = match.group(0)
+            if token[0] == '"' and _SAFE_IDENT.fullmatch(token[1:-1]):
+                return token[1:-1]
+            return token
+        return _SQL_TOKEN.sub(replacer, sql).strip()
 
     def save_schema(self, file_path="schema.sql"):
         try:
             with self._connect() as conn, open(file_path, "w") as schema_file:
                 cursor = conn.cursor()
-                cursor.execute("SELECT sql FROM sqlite_master WHERE type='table'")
-                for (table_schema,) in cursor.fetchall():
-                    if table_schema:
-                        cleaned_sql = self.clean_sql_quotes(table_schema)
-                        schema_file.write(f"{cleaned_sql};\n\n")
+                cursor.execute(
+                    "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+                    "ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END, rowid"
+                )
+                for (object_sql,) in cursor:
+                    cleaned_sql = self.clean_sql_quotes(object_sql)
+                    schema_file.write(f"{cleaned_sql};\n\n")
             print(f"Schema saved to {file_path}")
         except Exception as e:
             print(f"Error saving schema: {e}")
@@ -70,7 +218,8 @@ class SQLiteManager:
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (new_name,))
                 if cursor.fetchone():
                     raise ValueError(f"Table '{new_name}' already exists.")
-                cursor.execute(f"ALTER TABLE {current_name} RENAME TO {new_name};")
+                cursor.execute(f"ALTER TABLE {_quote_ident(current_name)} RENAME TO {_quote_ident(new_name)};")
+                self._columns = None
                 print(f"Renamed '{current_name}' to '{new_name}'.")
         except (sqlite3.Error, ValueError) as e:
             print(f"Error: {e}")
@@ -79,24 +228,28 @@ class SQLiteManager:
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA wal_checkpoint(FULL);")
-                cursor.execute(f"PRAGMA table_info({table_name});")
-                columns = cursor.fetchall()
-                col_names = [col[1] for col in columns]
+                quoted_table, quoted_new = _quote_ident(table_name), _quote_ident(new_col)
+                columns = self._table_columns(table_name)
+                col_names = [col["name"] for col in columns]
 
                 if old_col not in col_names:
                     raise ValueError(f"Column '{old_col}' not found.")
 
                 if sqlite3.sqlite_version_info >= (3, 25, 0):
                     cursor.execute(
-                        f'ALTER TABLE "{table_name}" RENAME COLUMN "{old_col}" TO "{new_col}";'
+                        f"ALTER TABLE {quoted_table} RENAME COLUMN {_quote_ident(old_col)} TO {quoted_new};"
                     )
+                    self._columns = None
                     print(f"Renamed column '{old_col}' to '{new_col}'.")
                 else:
-                    # Rebuild logic omitted for brevity
-                    print("Old SQLite version: manual rebuild required.")
-                if vacuum:
-                    cursor.execute("VACUUM;")
+                    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+                    table_sql = _rename_column_refs(cursor.fetchone()[0], old_col, new_col)
+                    body_start = next(m.end() for m in _SQL_TOKEN.finditer(table_sql) if m.group(0) == "(")
+                    schema = [table_sql[body_start:table_sql.rindex(")")]]
+                    self._rebuild_table(cursor, table_name, schema, col_names, renamed={old_col: new_col})
+                    print(f"Rebuilt '{table_name}' with column '{old_col}' renamed to '{new_col}'.")
+            if vacuum:
+                self._vacuum()
         except (sqlite3.Error, ValueError) as e:
             print(f"Error: {e}")
 
@@ -104,44 +257,95 @@ class SQLiteManager:
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({column});")
-                conn.commit()
+                if not any(col["name"] == column for col in self._table_columns(table)):
+                    raise ValueError(f"Column '{column}' not found in '{table}'.")
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote_ident(index_name)} "
+                    f"ON {_quote_ident(table)}({_quote_ident(column)});"
+                )
                 print(f"Index '{index_name}' created.")
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ValueError) as e:
             print(f"Error creating index: {e}")
 
+    def _rebuild_table(self, cursor, table, schema, columns, renamed=None):
+        renamed = renamed or {}
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL;",
+            (table,)
+        )
+        indexes = []
+        for index_name, index_sql in cursor.fetchall():
+            if all(info["name"] is None or info["name"] in columns for info in self._pragma(cursor, "index_info", index_name)):
+                for old_col, new_col in renamed.items():
+                    index_sql = _rename_column_refs(index_sql, old_col, new_col, is_table=False)
+                indexes.append(index_sql)
+
+        # Triggers on the table are dropped with it, and views or triggers that mention it (directly or
+        # through another view) would make the RENAME fail, so they are recreated afterwards as in
+        # SQLite's 12-step table rebuild
+        cursor.execute(
+            "SELECT type, name, tbl_name, sql FROM sqlite_master "
+            "WHERE type IN ('view', 'trigger') AND sql IS NOT NULL ORDER BY rowid;"
+        )
+        candidates = cursor.fetchall()
+        referenced = {table.lower()}
+        dependent_names = set()
+        found = True
+        while found:
+            found = False
+            for obj_type, name, tbl_name, sql in candidates:
+                if name not in dependent_names and (tbl_name.lower() in referenced or _references_any(sql, referenced)):
+                    dependent_names.add(name)
+                    if obj_type == "view":
+                        referenced.add(name.lower())
+                    found = True
+        dependents = [(obj_type, name, sql) for obj_type, name, _, sql in candidates if name in dependent_names]
+
+        quoted_table = _quote_ident(table)
+        temp_table = _quote_ident(f"{table}_temp")
+        source_cols = ", ".join(_quote_ident(col) for col in columns)
+        target_cols = ", ".join(_quote_ident(renamed.get(col, col)) for col in columns)
+        columns_version = self._columns_version
+        self._columns = None
+        cursor.execute("BEGIN IMMEDIATE;")
+        if self._schema_version(cursor) != columns_version:
+            raise ValueError(f"Schema of '{table}' changed while preparing the rebuild; try again.")
+        cursor.execute(f'CREATE TABLE {temp_table} ({", ".join(schema)});')
+        cursor.execute(f"INSERT INTO {temp_table} ({target_cols}) SELECT {source_cols} FROM {quoted_table};")
+        for obj_type, name, _ in dependents:
+            cursor.execute(f"DROP {obj_type.upper()} IF EXISTS {_quote_ident(name)};")
+        cursor.execute(f"DROP TABLE {quoted_table};")
+        cursor.execute(f"ALTER TABLE {temp_table} RENAME TO {quoted_table};")
+        for index_sql in indexes:
+            cursor.execute(index_sql)
+        for _, _, sql in dependents:
+            cursor.execute(sql)
+
     def add_primary_key(self, table, column):
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"PRAGMA table_info({table});")
-                columns = cursor.fetchall()
+                columns = self._table_columns(table)
                 new_columns = []
                 for col in columns:
-                    definition = f"{col[1]} {col[2]}"
-                    if col[1] == column:
+                    definition = f"{_quote_ident(col['name'])} {col['type']}"
+                    if col["name"] == column:
                         definition += " PRIMARY KEY"
-                    if col[3]:
+                    if col["notnull"]:
                         definition += " NOT NULL"
                     new_columns.append(definition)
 
-                cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_old;")
-                cursor.execute(f"CREATE TABLE {table} ({', '.join(new_columns)});")
-                cursor.execute(f"INSERT INTO {table} SELECT * FROM {table}_old;")
-                cursor.execute(f"DROP TABLE {table}_old;")
-                conn.commit()
+                self._rebuild_table(cursor, table, new_columns, [col["name"] for col in columns])
                 print(f"Primary key added to '{column}'.")
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ValueError) as e:
             print(f"Error adding primary key: {e}")
 
     def rebuild_indexes_and_vacuum(self):
         try:
             with self._connect() as conn:
-                cursor = conn.cursor()
-                cursor.execute("REINDEX;")
-                cursor.execute("VACUUM;")
-                conn.commit()
-                print("Rebuilt indexes and vacuumed.")
+                conn.execute("REINDEX;")
+            self._vacuum()
+            print("Rebuilt indexes and vacuumed.")
         except sqlite3.Error as e:
             print(f"Error: {e}")
 
@@ -150,7 +354,6 @@ class SQLiteManager:
             with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("ANALYZE;")
-                conn.commit()
                 print("Database analyzed.")
         except sqlite3.Error as e:
             print(f"Error: {e}")
@@ -176,22 +379,16 @@ class SQLiteManager:
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"PRAGMA table_info({table});")
-                columns = cursor.fetchall()
-                keep_cols = [col for col in columns if col[1] != column_to_remove]
+                columns = self._table_columns(table)
+                keep_cols = [col for col in columns if col["name"] != column_to_remove]
 
+                if len(keep_cols) == len(columns):
+                    raise ValueError(f"Column '{column_to_remove}' not found.")
                 if not keep_cols:
                     raise ValueError("Cannot remove the only column.")
 
-                temp_table = f"{table}_temp"
-                schema = ", ".join([f"{col[1]} {col[2]}" for col in keep_cols])
-                cursor.execute(f'CREATE TABLE "{temp_table}" ({schema});')
-
-                col_names = ", ".join(f'"{col[1]}"' for col in keep_cols)
-                cursor.execute(f'INSERT INTO "{temp_table}" ({col_names}) SELECT {col_names} FROM "{table}";')
-
-                cursor.execute(f'DROP TABLE "{table}";')
-                cursor.execute(f'ALTER TABLE "{temp_table}" RENAME TO "{table}";')
+                schema = [f"{_quote_ident(col['name'])} {col['type']}" for col in keep_cols]
+                self._rebuild_table(cursor, table, schema, [col["name"] for col in keep_cols])
                 print(f"Column '{column_to_remove}' removed from '{table}'.")
         except (sqlite3.Error, ValueError) as e:
             print(f"Error: {e}")
@@ -200,32 +397,22 @@ class SQLiteManager:
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA table_info(publications);")
-                columns = cursor.fetchall()
-                if "id" in [col[1] for col in columns]:
+                columns = self._table_columns("publications")
+                if any(col["name"] == "id" for col in columns):
                     print("'id' column already exists.")
                     return
 
                 print("Rebuilding 'publications' with 'id' PRIMARY KEY.")
                 schema = ["id INTEGER PRIMARY KEY AUTOINCREMENT"]
                 for col in columns:
-                    col_def = f"{col[1]} {col[2]}"
-                    if col[3]:
+                    col_def = f"{_quote_ident(col['name'])} {col['type']}"
+                    if col["notnull"]:
                         col_def += " NOT NULL"
                     schema.append(col_def)
 
-                temp_table = "publications_temp"
-                cursor.execute(f"CREATE TABLE {temp_table} ({', '.join(schema)});")
-
-                col_names = ", ".join(f'"{col[1]}"' for col in columns)
-                cursor.execute(
-                    f"INSERT INTO {temp_table} ({col_names}) SELECT {col_names} FROM publications;"
-                )
-
-                cursor.execute("DROP TABLE publications;")
-                cursor.execute(f"ALTER TABLE {temp_table} RENAME TO publications;")
+                self._rebuild_table(cursor, "publications", schema, [col["name"] for col in columns])
                 print("Added 'id' PRIMARY KEY to publications.")
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ValueError) as e:
             print(f"Error: {e}")
 
     def clean_up_database(self):
@@ -233,11 +420,12 @@ class SQLiteManager:
             with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DROP TABLE IF EXISTS publication_matches;")
+                self._columns = None
                 print("Cleanup complete.")
         except sqlite3.Error as e:
             print(f"Error during cleanup: {e}")
 
 
 if __name__=="__main__":
-    db = SQLiteManager("smartcampus.db")
-    db.save_schema()
\ No newline at end of file
+    with SQLiteManager("smartcampus.db") as db:
+        db.save_schema()
\ No newline at end of file
@@ -1,7 +1,210 @@
 import sqlite3
 import json
+import queue
 import random
 import string
+import struct
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from _bitscan import decode_many as _decode_many
+except ImportError:
+    _decode_many = None
+
+# The handler only reads the multi-GB dataset, so it maps a wider window than the editor
+HANDLER_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=2147483648;
+"""
+
+FETCH_BATCH_SIZE = 1000
+MAX_QUERY_PARAMS = 900
+BITMASK_64 = (1 << 64) - 1
+SUBSCRIPTION_COLUMNS = {"sql": "sql_subscription", "nlp": "nlp_subscription"}
+NOISE_ALPHABET = string.ascii_letters + string.digits + string.punctuation
+
+_unpack_u64 = struct.Struct(">Q").unpack
+
+if np is not None:
+    _NOISE_CODES = np.frombuffer(NOISE_ALPHABET.encode("utf-32-le"), dtype=np.uint32).copy()
+    _NOISE_BITS = np.random.PCG64()
+    _NOISE_RNG = np.random.Generator(_NOISE_BITS)
+else:
+    _NOISE_CODES = _NOISE_BITS = _NOISE_RNG = None
+
+if np is not None and njit is not None:
+    # Multiplying an isolated bit by a de Bruijn constant puts a unique value in the top six bits
+    _DE_BRUIJN_64 = np.uint64(0x03F79D71B4CB0A89)
+    _DE_BRUIJN_BITS = np.zeros(64, np.int64)
+    _DE_BRUIJN_BITS[[((0x03F79D71B4CB0A89 << bit) & BITMASK_64) >> 58 for bit in range(64)]] = np.arange(64)
+
+    @njit("Tuple((int64[:], int64[:]))(uint64[:])", cache=True)
+    def _scan_set_bits(masks):
+        """
+        Batch form of decode_blob_to_identifiers: visits only the set bits of each mask, lowest first.
+        Returns the flat bit positions and the number of positions that came from each mask.
+        """
+        positions = np.empty(masks.size * 64, np.int64)
+        counts = np.zeros(masks.size, np.int64)
+        one = np.uint64(1)
+        shift = np.uint64(58)
+        n = 0
+        for row in range(masks.size):
+            mask = masks[row]
+            start = n
+            while mask:
+                lowest = mask & (~mask + one)
+                positions[n] = _DE_BRUIJN_BITS[(lowest * _DE_BRUIJN_64) >> shift]
+                n += 1
+                mask &= mask - one
+            counts[row] = n - start
+        return positions[:n], counts
+
+    @njit("void(uint32[:], uint32[:], int64, int64)", cache=True)
+    def _scatter_noise(codes, alphabet, k, seed):
+        """
+        Overwrites k distinct positions of codes with random alphabet entries. Floyd's algorithm picks
+        the positions uniformly in k steps; a zeroed byte mask records which are taken.
+        """
+        np.random.seed(seed)
+        n = codes.size
+        taken = np.zeros(n, np.bool_)
+        for j in range(n - k, n):
+            pos = np.random.randint(0, j + 1)
+            if taken[pos]:
+                pos = j
+            taken[pos] = True
+            codes[pos] = alphabet[np.random.randint(alphabet.size)]
+else:
+    _scan_set_bits = None
+    _scatter_noise = None
+
+@lru_cache(maxsize=64)
+def _publications_in_query(columns, size):
+    return f"SELECT {columns} FROM publications WHERE id IN ({','.join('?' * size)})"
+
+def _pad_ids(ids):
+    """
+    Pads ids with NULLs up to the next power of two (capped at MAX_QUERY_PARAMS), so that only a
+    few distinct IN queries are ever built and SQLite's statement cache can reuse them.
+    """
+    size = min(1 << (len(ids) - 1).bit_length(), MAX_QUERY_PARAMS)
+    return ids + [None] * (size - len(ids))
+
+def _seeded_noise_rng():
+    """
+    Returns the NumPy noise generator reseeded from the random module, so random.seed() also fixes
+    the noise. Setting the PCG64 state directly is much cheaper than building a new Generator.
+    """
+    _NOISE_BITS.state = {
+        "bit_generator": "PCG64",
+        "state": {"state": random.getrandbits(128), "inc": 0xDA3E39CB94B95BDB},
+        "has_uint32": 0,
+        "uinteger": 0,
+    }
+    return _NOISE_RNG
+
+def _dump_json(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+def _dump_json_line(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class ConnectionPool:
+    def __init__(self, db_path, readers=4):
+        """
+        Opens one read-write connection; up to `readers` read-only connections are opened on demand.
+        WAL mode lets the read-only connections query while the writer is busy. The read-write
+        connection keeps sqlite3's same-thread check, so only the opening thread can use it.
+        """
+        self.rw_conn = self._open(db_path, shared=False)
+        # as_uri() percent-encodes characters such as ?, # and % that would otherwise end the path
+        self._reader_uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        self._readers = queue.Queue()
+        self._reader_slots = readers
+        self._reader_lock = threading.Lock()
+
+    @staticmethod
+    def _open(database, uri=False, shared=True):
+        conn = sqlite3.connect(database, uri=uri, check_same_thread=not shared)
+        conn.executescript(HANDLER_PRAGMAS)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def read(self):
+        """
+        Borrows a read-only connection and returns it to the pool afterwards.
+        """
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._open_reader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _open_reader(self):
+        """
+        Opens another read-only connection if the limit allows it, otherwise waits for a free one.
+        """
+        with self._reader_lock:
+            can_open = self._reader_slots > 0
+            if can_open:
+                self._reader_slots -= 1
+        if not can_open:
+            return self._readers.get()
+        try:
+            return self._open(self._reader_uri, uri=True)
+        except sqlite3.Error:
+            with self._reader_lock:
+                self._reader_slots += 1
+            raise
+
+    @contextmanager
+    def write(self):
+        """
+        Yields the read-write connection (only usable from the thread that opened the pool).
+        """
+        yield self.rw_conn
+
+    def close(self):
+        """
+        Closes every connection in the pool.
+        """
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        self.rw_conn.execute("PRAGMA optimize;")
+        self.rw_conn.close()
+
 
 class DBHandler:
     def __init__(self, db_path):
@@ -9,16 +212,19 @@ class DBHandler:
         Initializes the database handler with a path to the SQLite database file.
         """
         self.db_path = db_path
+        self.pool = None
         self.connection = None
         self.cursor = None
+        self._sub_rows = None
+        self._sub_cache = None
 
     def connect(self):
         """
-        Establishes a connection to the SQLite database.
+        Establishes a connection pool to the SQLite database.
         """
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row
+            self.pool = ConnectionPool(self.db_path)
+            self.connection = self.pool.rw_conn
             self.cursor = self.connection.cursor()
             print("Database connection established.")
         except sqlite3.Error as e:
@@ -30,8 +236,8 @@ class DBHandler:
         """
         if self.cursor:
             self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        if self.pool:
+            self.pool.close()
             print("Database connection closed.")
 
     def __enter__(self):
@@ -47,6 +253,21 @@ class DBHandler:
         """
         self.close()
 
+    @contextmanager
+    def read_txn(self):
+        """
+        Runs the enclosed reads on the read-write connection inside a single transaction, so they
+        share one snapshot and take the shared lock once instead of once per statement.
+        """
+        if self.connection.in_transaction:
+            yield self
+            return
+        self.connection.execute("BEGIN")
+        try:
+            yield self
+        finally:
+            self.connection.commit()
+
     def get_subscriptions(self, version="sql"):
         """
         Retrieves subscriptions in either 'sql' or 'nlp' format.
@@ -55,115 +276,150 @@ class DBHandler:
             version (str): Either 'sql' or 'nlp' to choose subscription type.
 
         Returns:
-            List[Dict]: A list of subscriptions with id and the selected version.
+            Iterator[Dict]: Subscriptions with id and the selected version.
         """
-        if version not in ("sql", "nlp"):
+        column_name = self._subscription_column(version)
+        self._load_sub_cache()
+        return (
+            {"subscription_id": row["id"], "subscription": row[column_name]} for row in self._sub_rows
+        )
+
+    @staticmethod
+    def _subscription_column(version):
+        if version not in SUBSCRIPTION_COLUMNS:
             raise ValueError("version must be either 'sql' or 'nlp'")
+        return SUBSCRIPTION_COLUMNS[version]
 
-        column_name = "sql_subscription" if version == "sql" else "nlp_subscription"
-
-        try:
-            query = f"SELECT id, {column_name} FROM subscriptions"
-            self.cursor.execute(query)
-            rows = self.cursor.fetchall()
-
-            subscriptions = [
-                {"subscription_id": row["id"], "subscription": row[column_name]} for row in rows
-            ]
-            return subscriptions
-
-        except sqlite3.Error as e:
-            print(f"An error occurred while fetching subscriptions: {e}")
-            return []
+    def _load_sub_cache(self):
+        """
+        Reads the subscriptions table once and keeps every version in memory, keyed by id.
+        There is at most one subscription per bit of the 64-bit match mask, so the cache stays small.
+        """
+        if self._sub_cache is None:
+            try:
+                with self.pool.read() as conn:
+                    rows = conn.execute("SELECT id, sql_subscription, nlp_subscription FROM subscriptions").fetchall()
+            except sqlite3.Error as e:
+                print(f"An error occurred while fetching subscriptions: {e}")
+                self._sub_rows = []
+                return {version: {} for version in SUBSCRIPTION_COLUMNS}
+
+            self._sub_rows = rows
+            self._sub_cache = {version: {} for version in SUBSCRIPTION_COLUMNS}
+            for row in rows:
+                for version, column_name in SUBSCRIPTION_COLUMNS.items():
+                    self._sub_cache[version].setdefault(row["id"], row[column_name])
+        return self._sub_cache
+
+    def _iter_random_publication_batches(self, limit):
+        """
+        Yields random publications in batches of at most MAX_QUERY_PARAMS rows. Publication ids are
+        sampled in Python and looked up by primary key, avoiding a full-table sort. Falls back to
+        reservoir sampling over all ids when gaps in the ids leave too few hits.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT MIN(id), MAX(id) FROM publications")
+        min_id, max_id = cursor.fetchone()
+        if max_id is None or limit <= 0:
+            return
+
+        id_range = range(min_id, max_id + 1)
+        sampled_ids = random.sample(id_range, min(len(id_range), limit * 2))
+        existing_ids = set()
+        for start in range(0, len(sampled_ids), MAX_QUERY_PARAMS):
+            batch = _pad_ids(sampled_ids[start:start + MAX_QUERY_PARAMS])
+            cursor.execute(_publications_in_query("id", len(batch)), batch)
+            existing_ids.update(pub_id for (pub_id,) in cursor)
+        selected_ids = [pub_id for pub_id in sampled_ids if pub_id in existing_ids][:limit]
+
+        if len(selected_ids) < limit:
+            selected_ids = self._reservoir_sample_ids(cursor, limit)
+
+        for start in range(0, len(selected_ids), MAX_QUERY_PARAMS):
+            batch = selected_ids[start:start + MAX_QUERY_PARAMS]
+            padded = _pad_ids(batch)
+            cursor.execute(_publications_in_query("*", len(padded)), padded)
+            rows_by_id = {row["id"]: row for row in cursor}
+            yield [rows_by_id[pub_id] for pub_id in batch]
+
+    @staticmethod
+    def _reservoir_sample_ids(cursor, limit):
+        """
+        Draws up to limit publication ids uniformly in one pass over the id column, in random order.
+        """
+        reservoir = []
+        for seen, (pub_id,) in enumerate(cursor.execute("SELECT id FROM publications")):
+            if seen < limit:
+                reservoir.append(pub_id)
+            else:
+                slot = random.randrange(seen + 1)
+                if slot < limit:
+                    reservoir[slot] = pub_id
+        random.shuffle(reservoir)
+        return reservoir
 
     def get_semi_structured_publications(self, limit, subscription_version="sql"):
         """
         Retrieves a number of random publications with their matching subscriptions.
         :param limit: Number of random publications to fetch.
         :param subscription_version: Either 'sql' or 'nlp' to determine which subscription type to use.
-        :return: List of dictionaries with publication and matched subscriptions.
+        :return: Iterator of dictionaries with publication and matched subscriptions.
         """
+        self._subscription_column(subscription_version)
+        subscriptions = self._load_sub_cache()[subscription_version]
+        return self._iter_semi_structured_publications(limit, subscriptions)
+
+    def _iter_semi_structured_publications(self, limit, subscriptions):
         try:
-            self.cursor.execute("SELECT * FROM publications ORDER BY RANDOM() LIMIT ?", (limit,))
-            publications = self.cursor.fetchall()
-
-            result = []
-            for pub in publications:
-                publication_id = pub["id"]
-                publication_str = pub["publication"]
-
-                raw_matches = pub["subscription_matches"]
-                match_ids = []
-                if raw_matches:
-                    match_ids = self.decode_blob_to_identifiers(raw_matches)
-
-                matches = []
-                for sub_id in match_ids:
-                    sub_col = "sql_subscription" if subscription_version == "sql" else "nlp_subscription"
-                    self.cursor.execute(f"SELECT {sub_col} AS subscription, id FROM subscriptions WHERE id = ?", (sub_id,))
-                    row = self.cursor.fetchone()
-                    if row:
-                        matches.append({
-                            "subscription": row["subscription"],
-                            "subscription_id": row["id"]
-                        })
-
-                result.append({
-                    "publication_id": publication_id,
-                    "publication": publication_str,
-                    "subscription_matches": matches
-                })
-
-            return result
+            for publications in self._iter_random_publication_batches(limit):
+                match_lists = self.decode_blobs_batch([pub["subscription_matches"] for pub in publications])
+
+                for pub, match_ids in zip(publications, match_lists):
+                    matches = [
+                        {"subscription": subscriptions[sub_id], "subscription_id": sub_id}
+                        for sub_id in match_ids if sub_id in subscriptions
+                    ]
+
+                    yield {
+                        "publication_id": pub["id"],
+                        "publication": pub["publication"],
+                        "subscription_matches": matches
+                    }
         except sqlite3.Error as e:
             print(f"An error occurred while fetching SEMI-structured publications: {e}")
-            return []
-        
+
     def get_publications_json(self, limit):
         """
         Retrieves a number of random publications with their matching subscription IDs in JSON format.
         :param limit: Number of random publications to fetch.
-        :return: List of publications in JSON format with matched subscription IDs.
+        :return: Iterator of publications in JSON format with matched subscription IDs.
         """
         try:
-            self.cursor.execute("SELECT * FROM publications ORDER BY RANDOM() LIMIT ?", (limit,))
-            publications = self.cursor.fetchall()
-
-            result = []
-            for pub in publications:
-                publication_id = pub["id"]
-                raw_matches = pub["subscription_matches"]
-
-                publication_json = {}
-                for key in pub.keys():
-                    if key not in ("id", "subscription_matches") and pub[key] is not None:
-                        publication_json[key] = pub[key]
-
-                publication_json_str = json.dumps(publication_json)
+            for publications in self._iter_random_publication_batches(limit):
+                match_lists = self.decode_blobs_batch([pub["subscription_matches"] for pub in publications])
 
-                match_ids = []
-                if raw_matches:
-                    match_ids = self.decode_blob_to_identifiers(raw_matches)
+                for pub, match_ids in zip(publications, match_lists):
+                    publication_json = {}
+                    for key in pub.keys():
+                        if key not in ("id", "subscription_matches") and pub[key] is not None:
+                            publication_json[key] = pub[key]
 
-                result.append({
-                    "publication_id": publication_id,
-                    "publication": publication_json_str,
-                    "subscription_matches": match_ids 
-                })
-
-            return result
+                    yield {
+                        "publication_id": pub["id"],
+                        "publication": json.dumps(publication_json),
+                        "subscription_matches": match_ids
+                    }
 
         except sqlite3.Error as e:
             print(f"An error occurred while fetching JSON publications: {e}")
-            return []
-   
+
     def get_publications_with_subscription_matches(self, limit, publication_version="semi", subscription_version="sql"):
         """
         Gets publications with all matching subscriptions in different publication versions.
         :param limit: Number of publications to fetch.
         :param publication_version: Type of publication representation.
         :param subscription_version: Type of subscription representation.
-        :return: List of publications with matched subscriptions.
+        :return: Iterator of publications with matched subscriptions.
         """
         if publication_version == "semi":
             return self.get_semi_structured_publications(limit, subscription_version)
@@ -180,13 +436,22 @@ class DBHandler:
         :return: Set of altered subscriptions.
         """
         num_noise = int(len(data) * noise_rate)
+        if np is not None and num_noise:
+            # UTF-32 gives one array element per character, so multibyte characters are never split
+            codes = np.frombuffer(data.encode("utf-32-le"), dtype=np.uint32).copy()
+            if _scatter_noise is not None:
+                _scatter_noise(codes, _NOISE_CODES, num_noise, random.getrandbits(31))
+            else:
+                rng = _seeded_noise_rng()
+                codes[rng.choice(codes.size, num_noise, replace=False)] = rng.choice(_NOISE_CODES, num_noise)
+            return codes.tobytes().decode("utf-32-le")
+
         indices = random.sample(range(len(data)), num_noise)
         noisy_data = list(data)
-        
-        for index in indices:
-            random_char = random.choice(string.ascii_letters + string.digits + string.punctuation)
+
+        for index, random_char in zip(indices, random.choices(NOISE_ALPHABET, k=num_noise)):
             noisy_data[index] = random_char
-        
+
         return ''.join(noisy_data)
     
     def get_subscriptions_with_errors(self, subscription_version="sql", error_rate=0.1):
@@ -196,7 +461,7 @@ class DBHandler:
         :param error_rate: The rate at which errors should be injected into the subscriptions.
         :return: A list of subscriptions, some of which are correct and some contain errors.
         """
-        subscriptions = self.get_subscriptions(version=subscription_version)
+        subscriptions = list(self.get_subscriptions(version=subscription_version))
 
         num_errors = int(len(subscriptions) * error_rate)  
         indices_to_change = random.sample(range(len(subscriptions)), num_errors)
@@ -219,26 +484,31 @@ class DBHandler:
         Fetches publications and subs and randomly injects noise into a publication row based on error_rate.
         :param publication_version: Format type ('json' or 'semi').
         :param error_rate: Fraction of publications to change (0.1 = 10%).
-        :return: List of publication with noise.
+        :return: Generator of publications, some with noise.
         """
-        publications = self.get_publications_with_subscription_matches(limit=1000, publication_version=publication_version, subscription_version="sql")
+        limit = 1000
+        publications = self.get_publications_with_subscription_matches(limit=limit, publication_version=publication_version, subscription_version="sql")
+        return self._iter_publications_with_errors(publications, limit, error_rate)
 
-        total = len(publications)
-        num_errors = int(total * error_rate)
-        error_indices = set(random.sample(range(total), num_errors))
+    def _iter_publications_with_errors(self, publications, limit, error_rate):
+        # The random publication batches always hold min(limit, COUNT(*)) rows, so the error rows can be
+        # drawn before streaming; counting here keeps it in the same read transaction as the rows
+        (count,) = self.cursor.execute("SELECT COUNT(*) FROM publications").fetchone()
+        total = min(limit, count)
+        error_indices = set(random.sample(range(total), int(total * error_rate)))
 
-        results = []
         for i, pub in enumerate(publications):
-            if i in error_indices:
-                noise_publication = self.inject_noise(pub["publication"], noise_rate=0.1)
-                results.append({
-                    "publication_id": pub["publication_id"],
-                    "publication": noise_publication,
-                    "subscription_matches": pub.get("subscription_matches", [])
-                })
-            else:
-                results.append(pub)
-        return results
+            yield self._process_pub(pub) if i in error_indices else pub
+
+    def _process_pub(self, pub):
+        """
+        Returns a copy of a publication row with noise injected into its text.
+        """
+        return {
+            "publication_id": pub["publication_id"],
+            "publication": self.inject_noise(pub["publication"], noise_rate=0.1),
+            "subscription_matches": pub.get("subscription_matches", [])
+        }
 
 
     def decode_blob_to_identifiers(self, blob):
@@ -259,10 +529,52 @@ class DBHandler:
             blob = bytes(blob, 'latin1')  # Use 'latin1' encoding to keep byte values unchanged
         
         # Convert the BLOB to a 64-bit integer
-        bitmask = int.from_bytes(blob, byteorder='big')
+        if len(blob) == 8:
+            (bitmask,) = _unpack_u64(blob)
+        else:
+            bitmask = int.from_bytes(blob, byteorder='big') & BITMASK_64
+
+        # Identify active bit positions by repeatedly isolating the lowest set bit
+        identifiers = []
+        while bitmask:
+            lowest_bit = bitmask & -bitmask
+            identifiers.append(lowest_bit.bit_length() - 1)
+            bitmask ^= lowest_bit
+        return identifiers
 
-        # Identify active bit positions
-        identifiers = [i for i in range(64) if bitmask & (1 << i)]
+    def decode_blobs_batch(self, blobs):
+        """
+        Decodes many subscription match BLOBs at once.
+
+        Args:
+            blobs (list): BLOBs as stored in 'subscription_matches'; empty or None entries decode to [].
+
+        Returns:
+            list: One list of active bit positions per BLOB, in the same order as decode_blob_to_identifiers.
+        """
+        blobs = [bytes(blob, 'latin1') if isinstance(blob, str) else blob for blob in blobs]
+        present = [i for i, blob in enumerate(blobs) if blob]
+        if np is None or any(len(blobs[i]) != 8 for i in present):
+            return [self.decode_blob_to_identifiers(blob) if blob else [] for blob in blobs]
+
+        identifiers = [[] for _ in blobs]
+        if not present:
+            return identifiers
+
+        joined = b"".join(blobs[i] for i in present)
+        if _decode_many is not None:
+            positions, counts = _decode_many(np.frombuffer(joined, dtype=">u8").astype(np.uint64))
+        elif _scan_set_bits is not None:
+            positions, counts = _scan_set_bits(np.frombuffer(joined, dtype=">u8").astype(np.uint64))
+        else:
+            masks = np.frombuffer(joined, dtype=np.uint8).reshape(-1, 8)
+            # Reverse each big-endian row so that column j of the unpacked bits is bit j of the mask
+            bits = np.unpackbits(masks[:, ::-1], axis=1, bitorder="little")
+            _, positions = np.nonzero(bits)
+            counts = bits.sum(axis=1)
+        per_row = np.split(positions, np.cumsum(counts)[:-1])
+        for i, row_positions in zip(present, per_row):
+            identifiers[i] = row_positions.tolist()
         return identifiers
 
     def save_to_json(self, data, filename):
@@ -270,12 +582,37 @@ class DBHandler:
         Saves the provided data to a JSON file.
 
         Args:
-            data (Any): The data to save.
+            data (Any): The data to save. Iterators are written item by item as a JSON array.
             filename (str): The name of the file to save the data into.
         """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(filename, 'wb') as f:
+                if not isinstance(data, Iterator):
+                    f.write(_dump_json(data))
+                else:
+                    # Stream the items of a generator as a JSON array laid out exactly like a dumped list
+                    separator = b"[\n  "
+                    for item in data:
+                        f.write(separator)
+                        f.write(_dump_json(item).replace(b"\n", b"\n  "))
+                        separator = b",\n  "
+                    f.write(b"[]" if separator == b"[\n  " else b"\n]")
+            print(f"Data successfully saved to {filename}")
+        except IOError as e:
+            print(f"An error occurred while saving to {filename}: {e}")
+
+    def save_to_json_stream(self, rows, filename):
+        """
+        Saves rows to a newline-delimited JSON (NDJSON) file, one compact JSON document per line.
+
+        Args:
+            rows (Iterable): The rows to save; generators are consumed lazily.
+            filename (str): The name of the file to save the data into.
+        """
+        try:
+            with open(filename, 'wb') as f:
+                for row in rows:
+                    f.write(_dump_json_line(row))
             print(f"Data successfully saved to {filename}")
         except IOError as e:
             print(f"An error occurred while saving to {filename}: {e}")
@@ -287,18 +624,13 @@ if __name__ == "__main__":
 
 
     with DBHandler(database) as db:
-        sql_subs = db.get_subscriptions("sql")
-        nlp_subs = db.get_subscriptions("nlp")
-        rand_pubs_subs = db.get_publications_with_subscription_matches(number_of_publications,"json")
-        rand_subs_with_errors = db.get_subscriptions_with_errors(subscription_version="sql", error_rate=0.1)
-        rand_pubs_with_errors = db.get_publications_with_errors("json", error_rate=0.1)
-
-        # Save to JSON
+        # Save to JSON; publication generators are streamed to disk while they are read
 
         dir = "smartcampus"
 
-        db.save_to_json(sql_subs, f"{dir}/sql_subscriptions.json")
-        db.save_to_json(nlp_subs, f"{dir}/nlp_subscriptions.json")
-        db.save_to_json(rand_pubs_subs, f"{dir}/publications_100.json")
-        db.save_to_json(rand_subs_with_errors, f"{dir}/subscriptions_with_errors.json")
-        db.save_to_json(rand_pubs_with_errors, f"{dir}/publications_with_errors.json")
\ No newline at end of file
+        db.save_to_json(db.get_subscriptions("sql"), f"{dir}/sql_subscriptions.json")
+        db.save_to_json(db.get_subscriptions("nlp"), f"{dir}/nlp_subscriptions.json")
+        db.save_to_json(db.get_subscriptions_with_errors(subscription_version="sql", error_rate=0.1), f"{dir}/subscriptions_with_errors.json")
+        with db.read_txn():
+            db.save_to_json(db.get_publications_with_subscription_matches(number_of_publications,"json"), f"{dir}/publications_100.json")
+            db.save_to_json(db.get_publications_with_errors("json", error_rate=0.1), f"{dir}/publications_with_errors.json")
\ No newline at end of file
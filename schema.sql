@@ -2,5 +2,3 @@ CREATE TABLE subscriptions (id INTEGER, complexity TEXT, nlp_subscription TEXT,
 
 CREATE TABLE publications (id INTEGER PRIMARY KEY AUTOINCREMENT, publication_id , timestamp , deveui , temperature , humidity , light , motion , co2 , battery , sound_avg , sound_peak , moisture , pressure , acceleration_x , acceleration_y , acceleration_z , rssi , lsnr , chan , port , rfch , seqn , fcnt , sensor_type , floor , location , publication , subscription_matches , timestamp_unix );
 
-CREATE TABLE sqlite_sequence(name,seq);
-